@@ -0,0 +1,865 @@
+"""
+The logo pipeline: download organization logos and upload them to
+Cloudflare R2.
+
+By default (--both behavior) every org in Mongo with an image URL but no
+`logo_r2_url` has its logo downloaded, uploaded to R2 and the resulting
+public URL written back onto the org document. Download tasks feed a
+bounded work queue consumed by uploader workers, so freshly downloaded
+bytes go straight to R2 without a second pass; Mongo writes are batched
+by a dedicated writer task.
+
+Modes:
+  --download-only   only populate the local cache under LOGOS_DIR
+                    (optionally as a tar.zst archive with --archive)
+  --upload-only     upload already-cached files from LOGOS_DIR
+  (neither)         download and upload in one pipelined pass
+
+A single aiohttp session handles both the downloads and the R2 PUTs
+(via presigned URLs; boto3 only signs and drives the multipart control
+plane), and an asyncio.Semaphore caps in-flight downloads.
+
+Run with: python scripts/download_and_upload_logos.py [--dry-run] [--limit N]
+
+Requires: pip install -r scripts/requirements.txt
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import io
+import json
+import sys
+import tarfile
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import aiofiles
+import aiohttp
+from pymongo import MongoClient, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from r2_client import (
+    DRY_RUN,
+    LOGOS_DIR,
+    MONGO_DB,
+    MONGO_URI,
+    R2_BUCKET_NAME,
+    R2_PUBLIC_URL,
+    get_r2_client,
+    validate_config,
+)
+
+KEEP_LOCAL = False
+MODE = "both"  # "both" | "download-only" | "upload-only"
+ARCHIVE = False
+FORCE = False
+
+# All uploads in a batch are logically "now"; set once per run() instead
+# of constructing a datetime per update. (datetime.utcnow is deprecated.)
+RUN_TS = None
+
+REQUEST_TIMEOUT = 30
+REQUEST_HEADERS = {
+    "User-Agent": "gsoc-orgs-guide/1.0 (+https://www.gsocorganizationsguide.com)"
+}
+MAX_CONCURRENCY = 20
+UPLOAD_WORKERS = 8
+WORK_QUEUE_SIZE = 64
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+BULK_FLUSH_SIZE = 500
+BULK_FLUSH_SECONDS = 5.0
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+PRESIGN_EXPIRY = 3600
+
+# Orgs that have a source image but no logo in R2 yet.
+ORGS_WITHOUT_LOGO_QUERY = {
+    "$and": [
+        {"image_slug": {"$exists": True, "$ne": None}},
+        {
+            "$or": [
+                {"image_url": {"$exists": True, "$ne": None}},
+                {"logoUrl": {"$exists": True, "$ne": None}},
+            ]
+        },
+        {
+            "$or": [
+                {"logo_r2_url": {"$exists": False}},
+                {"logo_r2_url": None},
+            ]
+        },
+    ]
+}
+# Orgs with a source image at all, used by --download-only to (re)build
+# the whole local cache regardless of R2 state.
+ORGS_WITH_IMAGE_QUERY = {
+    "$and": [
+        {"image_slug": {"$exists": True, "$ne": None}},
+        {
+            "$or": [
+                {"image_url": {"$exists": True, "$ne": None}},
+                {"logoUrl": {"$exists": True, "$ne": None}},
+            ]
+        },
+    ]
+}
+# Only the fields the pipeline touches; full org docs are ~10x bigger.
+ORG_PROJECTION = {
+    "_id": 0,
+    "canonical_id": 1,
+    "slug": 1,
+    "image_slug": 1,
+    "image_url": 1,
+    "logoUrl": 1,
+    "logo_etag": 1,
+    "logo_last_modified": 1,
+}
+LOGO_SCAN_INDEX = [("logo_r2_url", 1), ("image_slug", 1), ("image_url", 1)]
+LOGO_SCAN_INDEX_NAME = "logo_scan"
+
+
+def ensure_logo_scan_index(db):
+    """Idempotently create the compound index backing the logo scan."""
+    db.organizations.create_index(
+        LOGO_SCAN_INDEX,
+        name=LOGO_SCAN_INDEX_NAME,
+        partialFilterExpression={"image_slug": {"$exists": True}},
+    )
+
+
+def load_org_groups(db, query, limit=None):
+    """Stream the scan cursor and group orgs by their logo source.
+
+    Runs off the event loop (blocking pymongo I/O); the cursor pages in
+    batches of 500 so only projected docs are ever held, grouped by
+    (image URL, image_slug) for the dedup fan-out.
+    """
+    cursor = db.organizations.find(query, ORG_PROJECTION).batch_size(500)
+    if not DRY_RUN:
+        # Dry runs skip create_index, so the hinted index may not exist.
+        cursor = cursor.hint(LOGO_SCAN_INDEX_NAME)
+    if limit:
+        cursor = cursor.limit(limit)
+    groups = defaultdict(list)
+    total = 0
+    for org in cursor:
+        url = org.get("image_url") or org.get("logoUrl")
+        groups[(url, org.get("image_slug"))].append(org)
+        total += 1
+    return groups, total
+
+
+_EXT_TO_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".ico": "image/x-icon",
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def get_extension_from_url(url):
+    ext = Path(urlparse(url).path).suffix.lower()
+    return ext if ext in _EXT_TO_MIME else ".png"
+
+
+def get_content_type(ext):
+    return _EXT_TO_MIME.get(ext, "image/png")
+
+
+_MAGIC_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+
+def sniff_content_type(body, header_ct=None, ext=None):
+    """Detect the mime type from the payload itself.
+
+    URL extensions lie (GitHub raw URLs without one, SVGs served under
+    .png), and a wrong mime breaks browser caching and CDN transforms.
+    Magic bytes win, then the upstream Content-Type header, then the
+    extension guess.
+    """
+    head = bytes(body[:256])
+    for sig, mime in _MAGIC_SIGNATURES:
+        if head.startswith(sig):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    stripped = head.lstrip()
+    if stripped.startswith(b"<?xml") or stripped.startswith(b"<svg"):
+        return "image/svg+xml"
+    if head[:4] == b"\x00\x00\x01\x00":
+        return "image/x-icon"
+    if header_ct and header_ct.split(";")[0].strip().startswith("image/"):
+        return header_ct.split(";")[0].strip()
+    return get_content_type(ext)
+
+
+def generate_r2_key(org, ext):
+    return f"logos/{org['image_slug']}{ext}"
+
+
+class HostRateLimiter:
+    """Sliding-window limiter, one window per upstream host.
+
+    Downloads fan out to many different hosts, so throttling per host
+    instead of sleeping between orgs keeps each upstream polite without
+    stalling the whole pipeline. R2 PUTs are not limited.
+    """
+
+    def __init__(self, max_rate=2, period=1.0):
+        self.max_rate = max_rate
+        self.period = period
+        self._lock = asyncio.Lock()
+        self._hits = defaultdict(deque)
+
+    async def acquire(self, host):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                hits = self._hits[host]
+                while hits and now - hits[0] >= self.period:
+                    hits.popleft()
+                if len(hits) < self.max_rate:
+                    hits.append(now)
+                    return
+                wait = self.period - (now - hits[0])
+            await asyncio.sleep(wait)
+
+
+RATE_LIMITER = HostRateLimiter()
+
+
+class LogoArchive:
+    """Append downloaded logos into one tar.zst instead of loose files.
+
+    tar + zstd streams cannot be appended in place, so each run writes
+    its own logos-<timestamp>.tar.zst and logos-index.json accumulates
+    the member -> archive mapping across runs. The index doubles as the
+    "already downloaded" check that loose-file mode does with exists().
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = directory / "logos-index.json"
+        if self.index_path.exists():
+            self.index = json.loads(self.index_path.read_text())
+        else:
+            self.index = {}
+        self.archive_name = f"logos-{time.strftime('%Y%m%d-%H%M%S')}.tar.zst"
+        self._fh = None
+        self._writer = None
+        self._tar = None
+
+    def __contains__(self, member):
+        return member in self.index
+
+    def _ensure_open(self):
+        if self._tar is None:
+            self._fh = open(self.directory / self.archive_name, "wb")
+            self._writer = zstandard.ZstdCompressor().stream_writer(self._fh)
+            self._tar = tarfile.open(mode="w|", fileobj=self._writer)
+
+    def add(self, member, data):
+        self._ensure_open()
+        info = tarfile.TarInfo(member)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        self.index[member] = {"archive": self.archive_name, "size": len(data)}
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._writer.close()
+            self._fh.close()
+        self.index_path.write_text(json.dumps(self.index, indent=2, sort_keys=True))
+
+
+class LogoArchiveReader:
+    """Read logos back out of the tar.zst archives LogoArchive wrote.
+
+    logos-index.json maps each member to the archive file holding it.
+    tar + zstd streams have no random access, so the first member
+    requested from an archive decompresses that archive once and keeps
+    its members in memory; logos are small, and that beats rescanning
+    the stream per member.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        index_path = directory / "logos-index.json"
+        if index_path.exists():
+            self.index = json.loads(index_path.read_text())
+        else:
+            self.index = {}
+        self._members = {}
+
+    def __contains__(self, member):
+        return member in self.index
+
+    def _load(self, archive_name):
+        members = {}
+        with open(self.directory / archive_name, "rb") as fh:
+            reader = zstandard.ZstdDecompressor().stream_reader(fh)
+            with tarfile.open(mode="r|", fileobj=reader) as tar:
+                for info in tar:
+                    members[info.name] = tar.extractfile(info).read()
+        self._members[archive_name] = members
+        return members
+
+    def read(self, member):
+        archive_name = self.index[member]["archive"]
+        members = self._members.get(archive_name)
+        if members is None:
+            members = self._load(archive_name)
+        return members[member]
+
+
+class ContentDedupe:
+    """Cache of uploaded content hashes -> public URL.
+
+    Two distinct source URLs can serve byte-identical logos (parent orgs
+    reusing artwork); the per-hash lock ensures only the first group in
+    flight uploads, the rest reuse its URL.
+    """
+
+    def __init__(self):
+        self.cache = {}
+        self.locks = defaultdict(asyncio.Lock)
+
+
+def list_existing_keys(s3):
+    """Snapshot every key in the bucket with paginated list_objects_v2.
+
+    One listing page covers 1000 keys, so this costs a handful of
+    round-trips where per-key head_object would cost thousands.
+    """
+    existing = set()
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=R2_BUCKET_NAME):
+        for obj in page.get("Contents", []):
+            existing.add(obj["Key"])
+    return existing
+
+
+async def download_logo(session, url, etag=None, last_modified=None):
+    """Fetch a logo, honoring any cached validators.
+
+    Returns (status, body, caching) where status is "ok", "unchanged" or
+    "fail"; caching carries the response's ETag/Last-Modified so callers
+    can persist them for the next run's conditional GET.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    await RATE_LIMITER.acquire(urlparse(url).netloc)
+    try:
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return "unchanged", None, {}
+            if resp.status != 200:
+                print(f"[fail] GET {url} -> HTTP {resp.status}")
+                return "fail", None, {}
+            # Preallocate from Content-Length when the server provides
+            # one so the buffer is sized in a single allocation instead
+            # of growing (realloc + copy) chunk by chunk; the bytearray
+            # is returned as-is rather than copied into a fresh bytes.
+            length = resp.content_length
+            buf = bytearray(length) if length else bytearray()
+            offset = 0
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                end = offset + len(chunk)
+                if length and end <= len(buf):
+                    buf[offset:end] = chunk
+                else:
+                    # Server sent more than it declared; fall back to growth.
+                    if length and len(buf) > offset:
+                        del buf[offset:]
+                    buf += chunk
+                offset = end
+            if length and offset < len(buf):
+                del buf[offset:]
+            caching = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "content_type": resp.headers.get("Content-Type"),
+            }
+            return "ok", buf, caching
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        print(f"[fail] GET {url} -> {exc}")
+        return "fail", None, {}
+
+
+async def upload_part(session, url, chunk, part_number):
+    async with session.put(url, data=chunk) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"part {part_number} -> HTTP {resp.status}")
+        return {"PartNumber": part_number, "ETag": resp.headers["ETag"]}
+
+
+async def upload_to_r2(session, s3, body, r2_key, content_type):
+    """Upload via presigned URLs over the shared aiohttp session.
+
+    Small files (the common case for logos) go up as one presigned PUT;
+    anything over MULTIPART_THRESHOLD is split into presigned parts
+    uploaded in parallel. boto3 only signs URLs and drives the multipart
+    create/complete calls.
+    """
+    if len(body) < MULTIPART_THRESHOLD:
+        url = s3.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": R2_BUCKET_NAME,
+                "Key": r2_key,
+                "ContentType": content_type,
+            },
+            ExpiresIn=PRESIGN_EXPIRY,
+        )
+        async with session.put(
+            url, data=body, headers={"Content-Type": content_type}
+        ) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"PUT {r2_key} -> HTTP {resp.status}")
+        return
+
+    mpu = await asyncio.to_thread(
+        s3.create_multipart_upload,
+        Bucket=R2_BUCKET_NAME,
+        Key=r2_key,
+        ContentType=content_type,
+    )
+    upload_id = mpu["UploadId"]
+    try:
+        puts = []
+        mv = memoryview(body)
+        for part_number, offset in enumerate(range(0, len(body), PART_SIZE), 1):
+            url = s3.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": R2_BUCKET_NAME,
+                    "Key": r2_key,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=PRESIGN_EXPIRY,
+            )
+            puts.append(
+                upload_part(session, url, mv[offset : offset + PART_SIZE], part_number)
+            )
+        parts = await asyncio.gather(*puts)
+        await asyncio.to_thread(
+            s3.complete_multipart_upload,
+            Bucket=R2_BUCKET_NAME,
+            Key=r2_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+        )
+    except Exception:
+        await asyncio.to_thread(
+            s3.abort_multipart_upload,
+            Bucket=R2_BUCKET_NAME,
+            Key=r2_key,
+            UploadId=upload_id,
+        )
+        raise
+
+
+async def flush_updates(db, ops):
+    if DRY_RUN:
+        print(f"[mongo] dry run, dropping {len(ops)} updates")
+        return
+    try:
+        result = await asyncio.to_thread(
+            db.organizations.bulk_write, ops, ordered=False
+        )
+        print(f"[mongo] flushed {len(ops)} updates: {result.bulk_api_result}")
+    except BulkWriteError as exc:
+        print(f"[fail] bulk_write: {exc.details}")
+
+
+async def mongo_writer(db, update_queue):
+    """Drain UpdateOne ops off the queue and flush them in batches.
+
+    Flushes when BULK_FLUSH_SIZE ops have accumulated or BULK_FLUSH_SECONDS
+    pass without a new op, whichever comes first. A None sentinel ends the
+    task after a final flush.
+    """
+    ops = []
+    while True:
+        try:
+            op = await asyncio.wait_for(update_queue.get(), timeout=BULK_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            if ops:
+                await flush_updates(db, ops)
+                ops = []
+            continue
+        if op is None:
+            break
+        ops.append(op)
+        if len(ops) >= BULK_FLUSH_SIZE:
+            await flush_updates(db, ops)
+            ops = []
+    if ops:
+        await flush_updates(db, ops)
+
+
+async def queue_org_update(update_queue, orgs_group, update):
+    canonical_ids = [o["canonical_id"] for o in orgs_group]
+    if len(canonical_ids) == 1:
+        op = UpdateOne({"canonical_id": canonical_ids[0]}, {"$set": update})
+    else:
+        op = UpdateMany({"canonical_id": {"$in": canonical_ids}}, {"$set": update})
+    await update_queue.put(op)
+    return len(canonical_ids)
+
+
+async def download_stage(
+    orgs_group,
+    session,
+    work_queue,
+    update_queue,
+    semaphore,
+    existing_keys,
+    counts,
+    archive,
+):
+    """Produce the payload for one group of orgs sharing a logo source.
+
+    Depending on MODE the bytes come from the network or from LOGOS_DIR;
+    unless this is a download-only run, the result is enqueued for the
+    uploader workers, keeping freshly fetched bytes hot instead of
+    re-reading them from disk in a second pass.
+    """
+    org = orgs_group[0]
+    async with semaphore:
+        url = org.get("image_url") or org.get("logoUrl")
+        if not url:
+            print(f"[skip] {org.get('slug', '?')}: no image URL")
+            counts["skipped"] += 1
+            return
+
+        ext = get_extension_from_url(url)
+        local_filename = f"{org['image_slug']}{ext}"
+        r2_key = generate_r2_key(org, ext)
+
+        # Resume: the object survived an earlier crashed run that never
+        # got to the Mongo write; backfill the doc without re-uploading.
+        if existing_keys is not None and r2_key in existing_keys:
+            if DRY_RUN:
+                print(f"[skip] {org.get('slug', '?')}: dry run, not backfilling")
+                counts["skipped"] += 1
+                return
+            public_url = f"{R2_PUBLIC_URL}/{r2_key}"
+            count = await queue_org_update(
+                update_queue,
+                orgs_group,
+                {"logo_r2_url": public_url, "logo_uploaded_at": RUN_TS},
+            )
+            print(f"[ok] {org.get('slug', '?')} (x{count}): already in R2, backfilled")
+            counts["uploaded"] += 1
+            return
+
+        if MODE == "upload-only":
+            local_path = LOGOS_DIR / local_filename
+            if local_path.exists():
+                async with aiofiles.open(local_path, "rb") as f:
+                    body = await f.read()
+            elif archive is not None and local_filename in archive:
+                body = await asyncio.to_thread(archive.read, local_filename)
+            else:
+                print(f"[skip] {org.get('slug', '?')}: no local copy of {local_filename}")
+                counts["skipped"] += 1
+                return
+            caching = {}
+        else:
+            local_path = LOGOS_DIR / local_filename
+            have_copy = (
+                local_filename in archive
+                if archive is not None
+                else local_path.exists()
+            )
+            if MODE == "download-only" and not FORCE and have_copy:
+                print(f"[skip] {org.get('slug', '?')}: already cached")
+                counts["skipped"] += 1
+                return
+            # Only send conditional-GET validators when a cached copy
+            # exists to fall back on; a 304 carries no body, so asking
+            # "has it changed?" without one would lose the logo entirely
+            # (e.g. a rebuild of a fresh LOGOS_DIR, or an org whose
+            # logo_etag survived but whose logo_r2_url did not).
+            status, body, caching = await download_logo(
+                session,
+                url,
+                etag=org.get("logo_etag") if have_copy else None,
+                last_modified=org.get("logo_last_modified") if have_copy else None,
+            )
+            if status == "unchanged":
+                if MODE == "download-only":
+                    print(f"[skip] {org.get('slug', '?')}: not modified upstream")
+                    counts["skipped"] += 1
+                    return
+                # Upstream confirmed the local copy is current; upload
+                # from it instead of skipping the org.
+                async with aiofiles.open(local_path, "rb") as f:
+                    body = await f.read()
+                caching = {
+                    "etag": org.get("logo_etag"),
+                    "last_modified": org.get("logo_last_modified"),
+                }
+            if status == "fail":
+                counts["failed"] += 1
+                return
+            if not body:
+                print(f"[fail] {org.get('slug', '?')}: empty download")
+                counts["failed"] += 1
+                return
+            if status == "ok":
+                counts["downloaded"] += 1
+
+            if status == "ok" and (KEEP_LOCAL or MODE == "download-only"):
+                if archive is not None:
+                    archive.add(local_filename, body)
+                else:
+                    async with aiofiles.open(local_path, "wb") as f:
+                        await f.write(body)
+
+            if MODE == "download-only":
+                print(
+                    f"[ok] {org.get('slug', '?')} -> {local_filename} "
+                    f"({len(body)} bytes)"
+                )
+                return
+
+        if DRY_RUN:
+            print(f"[skip] {org.get('slug', '?')}: dry run, not uploading")
+            counts["skipped"] += 1
+            return
+
+        content_type = sniff_content_type(body, caching.get("content_type"), ext)
+        await work_queue.put(
+            (orgs_group, body, content_type, r2_key, local_filename, caching)
+        )
+
+
+async def upload_worker(session, s3, work_queue, update_queue, dedupe, counts):
+    """Consume downloaded payloads and ship them to R2.
+
+    The content-hash dedup lives here so byte-identical logos from
+    different source URLs are uploaded once regardless of which worker
+    sees them first. A None sentinel ends the worker.
+    """
+    while True:
+        item = await work_queue.get()
+        if item is None:
+            return
+        orgs_group, body, content_type, r2_key, local_filename, caching = item
+        org = orgs_group[0]
+
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        async with dedupe.locks[digest]:
+            public_url = dedupe.cache.get(digest)
+            if public_url is None:
+                try:
+                    await upload_to_r2(session, s3, body, r2_key, content_type)
+                except Exception as exc:
+                    print(f"[fail] PUT {r2_key} -> {exc}")
+                    counts["failed"] += 1
+                    continue
+                public_url = f"{R2_PUBLIC_URL}/{r2_key}"
+                dedupe.cache[digest] = public_url
+            else:
+                print(
+                    f"[skip] {org.get('slug', '?')}: identical bytes already at "
+                    f"{public_url}"
+                )
+
+        update = {
+            "logo_r2_url": public_url,
+            "logo_uploaded_at": RUN_TS,
+        }
+        if caching.get("etag"):
+            update["logo_etag"] = caching["etag"]
+        if caching.get("last_modified"):
+            update["logo_last_modified"] = caching["last_modified"]
+        if KEEP_LOCAL:
+            update["logo_local_filename"] = local_filename
+        count = await queue_org_update(update_queue, orgs_group, update)
+        print(f"[ok] {org.get('slug', '?')} (x{count}) -> {public_url}")
+        counts["uploaded"] += 1
+
+
+async def run(limit=None, resume=False):
+    global RUN_TS
+
+    validate_config()
+    RUN_TS = datetime.now(timezone.utc)
+    if ARCHIVE and zstandard is None:
+        print("[ERROR] --archive requires the zstandard package (pip install zstandard)")
+        sys.exit(1)
+    if KEEP_LOCAL or MODE == "download-only":
+        LOGOS_DIR.mkdir(parents=True, exist_ok=True)
+    archive = None
+    if MODE == "download-only" and ARCHIVE:
+        archive = LogoArchive(LOGOS_DIR)
+    elif MODE == "upload-only" and (LOGOS_DIR / "logos-index.json").exists():
+        # The cache was built with --archive; serve uploads from it.
+        if zstandard is None:
+            print(
+                "[ERROR] LOGOS_DIR holds a tar.zst cache; reading it requires "
+                "the zstandard package (pip install zstandard)"
+            )
+            sys.exit(1)
+        archive = LogoArchiveReader(LOGOS_DIR)
+
+    client = MongoClient(MONGO_URI)
+    db = client[MONGO_DB]
+
+    if not DRY_RUN:
+        await asyncio.to_thread(ensure_logo_scan_index, db)
+    query = ORGS_WITH_IMAGE_QUERY if MODE == "download-only" else ORGS_WITHOUT_LOGO_QUERY
+    groups, total = await asyncio.to_thread(load_org_groups, db, query, limit)
+
+    print(
+        f"[START] {total} orgs across {len(groups)} unique logo sources "
+        f"(mode={MODE} dry_run={DRY_RUN})"
+    )
+
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    s3 = get_r2_client()
+
+    existing_keys = None
+    if resume and MODE != "download-only":
+        existing_keys = await asyncio.to_thread(list_existing_keys, s3)
+        print(f"[resume] {len(existing_keys)} keys already in {R2_BUCKET_NAME}")
+
+    counts = {"downloaded": 0, "uploaded": 0, "skipped": 0, "failed": 0}
+    async with aiohttp.ClientSession(
+        headers=REQUEST_HEADERS, timeout=timeout
+    ) as session:
+        update_queue = asyncio.Queue()
+        writer = asyncio.create_task(mongo_writer(db, update_queue))
+        work_queue = asyncio.Queue(maxsize=WORK_QUEUE_SIZE)
+        dedupe = ContentDedupe()
+        uploaders = []
+        if MODE != "download-only":
+            uploaders = [
+                asyncio.create_task(
+                    upload_worker(session, s3, work_queue, update_queue, dedupe, counts)
+                )
+                for _ in range(UPLOAD_WORKERS)
+            ]
+
+        await asyncio.gather(
+            *[
+                download_stage(
+                    group,
+                    session,
+                    work_queue,
+                    update_queue,
+                    semaphore,
+                    existing_keys,
+                    counts,
+                    archive,
+                )
+                for group in groups.values()
+            ]
+        )
+        for _ in uploaders:
+            await work_queue.put(None)
+        if uploaders:
+            await asyncio.gather(*uploaders)
+        await update_queue.put(None)
+        await writer
+
+    if isinstance(archive, LogoArchive):
+        archive.close()
+    print(
+        f"[DONE] downloaded={counts['downloaded']} uploaded={counts['uploaded']} "
+        f"skipped={counts['skipped']} failed={counts['failed']}"
+    )
+
+    client.close()
+
+
+def main():
+    global DRY_RUN, KEEP_LOCAL, MODE, ARCHIVE, FORCE
+
+    parser = argparse.ArgumentParser(
+        description="Download org logos and upload them to R2"
+    )
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        "--download-only",
+        action="store_true",
+        help="only populate the local cache under LOGOS_DIR",
+    )
+    mode_group.add_argument(
+        "--upload-only",
+        action="store_true",
+        help="upload already-cached files from LOGOS_DIR",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="download only, skip R2 + Mongo writes")
+    parser.add_argument("--keep-local", action="store_true", help="also write each logo to LOGOS_DIR")
+    parser.add_argument("--limit", type=int, default=None, help="process at most N orgs")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip uploads for keys already in R2 (backfills Mongo only)",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="with --download-only: write a tar.zst archive instead of loose files",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="with --download-only: re-download even if already cached",
+    )
+    args = parser.parse_args()
+
+    if args.archive and not args.download_only:
+        parser.error("--archive requires --download-only")
+    if args.force and not args.download_only:
+        parser.error("--force requires --download-only")
+
+    if args.download_only:
+        MODE = "download-only"
+    elif args.upload_only:
+        MODE = "upload-only"
+    if args.dry_run:
+        DRY_RUN = True
+    if args.keep_local:
+        KEEP_LOCAL = True
+    if args.archive:
+        ARCHIVE = True
+    if args.force:
+        FORCE = True
+
+    asyncio.run(run(limit=args.limit, resume=args.resume))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Shared environment config and R2 client for the logo pipeline scripts.
+
+Loads .env once, exposes the Mongo/R2 settings as module constants, and
+memoizes the boto3 client so repeated callers (or tests importing both
+entry scripts) pay botocore's service-model load and TLS setup once.
+"""
+
+import functools
+import os
+import sys
+from pathlib import Path
+
+import boto3
+from botocore.config import Config
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+load_dotenv(ROOT_DIR / ".env")
+
+MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB = os.getenv("MONGO_DB", "gsoc")
+R2_ACCESS_KEY_ID = os.getenv("R2_ACCESS_KEY_ID")
+R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY")
+R2_ACCOUNT_ID = os.getenv("R2_ACCOUNT_ID")
+R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME")
+R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL", "").rstrip("/")
+LOGOS_DIR = Path(os.getenv("LOGOS_DIR", "./logos-webp"))
+DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
+
+
+def validate_config(require_mongo=True, require_public_url=True):
+    required = {
+        "R2_ACCESS_KEY_ID": R2_ACCESS_KEY_ID,
+        "R2_SECRET_ACCESS_KEY": R2_SECRET_ACCESS_KEY,
+        "R2_ACCOUNT_ID": R2_ACCOUNT_ID,
+        "R2_BUCKET_NAME": R2_BUCKET_NAME,
+    }
+    if require_mongo:
+        required["MONGO_URI"] = MONGO_URI
+    if require_public_url:
+        required["R2_PUBLIC_URL"] = R2_PUBLIC_URL
+    missing = [name for name, value in required.items() if not value]
+    if missing:
+        print(f"[ERROR] Missing required env vars: {', '.join(missing)}")
+        sys.exit(1)
+
+
+@functools.lru_cache(maxsize=1)
+def get_r2_client():
+    return boto3.client(
+        "s3",
+        endpoint_url=f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
+        aws_access_key_id=R2_ACCESS_KEY_ID,
+        aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=32,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive"},
+        ),
+    )
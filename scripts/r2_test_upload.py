@@ -0,0 +1,46 @@
+"""
+Upload a single local file to R2 to verify bucket credentials and wiring.
+
+Run with: python scripts/r2_test_upload.py path/to/file.png [--key logos/test.png]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from r2_client import R2_BUCKET_NAME, R2_PUBLIC_URL, get_r2_client, validate_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload one file to R2 as a smoke test")
+    parser.add_argument("path", help="local file to upload")
+    parser.add_argument("--key", default="logos/test.png", help="destination key in the bucket")
+    args = parser.parse_args()
+
+    validate_config(require_mongo=False, require_public_url=False)
+
+    local_path = Path(args.path)
+    if not local_path.is_file():
+        print(f"[ERROR] No such file: {local_path}")
+        sys.exit(1)
+
+    s3 = get_r2_client()
+
+    # upload_fileobj streams the file in chunks (multipart above 8 MiB)
+    # instead of buffering the whole payload in memory first.
+    with open(local_path, "rb") as f:
+        s3.upload_fileobj(
+            f,
+            R2_BUCKET_NAME,
+            args.key,
+            ExtraArgs={"ContentType": "image/png"},
+        )
+
+    size = local_path.stat().st_size
+    print(f"[ok] uploaded {local_path} ({size} bytes) -> {args.key}")
+    if R2_PUBLIC_URL:
+        print(f"[ok] public URL: {R2_PUBLIC_URL}/{args.key}")
+
+
+if __name__ == "__main__":
+    main()